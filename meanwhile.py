@@ -5,6 +5,8 @@ fashion, ```meanwhile``` makes it easy.
 
 It can make your code significantly faster, especially if the function requires
 I/O operations, like file access or HTTP(S) queries.
+On free-threaded builds of Python (3.13t and later), CPU-bound functions can
+benefit as well.
 
 Simple Usage Example:
 
@@ -30,13 +32,32 @@ Note that if your function prints output, you probably want to use
 This function prevents conflicts both with other threads, and with the progress
 updates shown by the `wait` method.
 
+If your target is a coroutine function, use `meanwhile.AsyncJob` instead of
+`meanwhile.Job`; see help(meanwhile.AsyncJob).
+
 For the full documentation, see https://github.com/hagai-helman/meanwhile.
 """
 
-from threading import Thread, Lock
-from queue import Queue, Empty
+from threading import Thread, Lock, Condition
+from os import environ
+import sys
+from collections import deque
 from time import time, sleep
-from random import choice
+from random import randrange
+
+# Thread Safety
+# *************
+#
+# Some of the job's state is accessed without locks. In these cases, we rely
+# only on single operations of the builtin dict and deque types being atomic
+# (e.g. storing an item, popping an item, or taking the length). On regular
+# builds of CPython this is guaranteed by the GIL; on free-threaded builds
+# (3.13t and later) it is guaranteed by the per-object locks of these types,
+# so the same code runs without the GIL, and CPU-bound target functions
+# actually run in parallel.
+#
+# Read-modify-write sequences (e.g. incrementing a counter) are never assumed
+# to be atomic, and are always protected by a lock.
 
 # Console Output And Printing
 # ***************************
@@ -60,6 +81,48 @@ _print = print
 _plock = Lock()
 _status = None
 
+# When the standard output is a terminal that supports it, we erase the
+# status line using the ANSI "erase line" escape sequence.
+#
+# The check is done once for each sys.stdout object; _ansi_stdout is the last
+# object checked, and _ansi_result is the result.
+
+_ansi_stdout = None
+_ansi_result = False
+
+def _ansi():
+    """Check whether the standard output supports ANSI escape sequences.
+    """
+    global _ansi_stdout, _ansi_result
+    if sys.stdout is not _ansi_stdout:
+        _ansi_stdout = sys.stdout
+        _ansi_result = _check_ansi(_ansi_stdout)
+    return _ansi_result
+
+def _check_ansi(stdout):
+    """Check whether the given output stream supports ANSI escape sequences.
+    """
+    try:
+        if not stdout.isatty():
+            return False
+    except (AttributeError, ValueError):
+        return False
+    if environ.get("TERM") == "dumb":
+        return False
+
+    # Windows consoles only interpret escape sequences if VT processing is
+    # enabled, which Python does not do; we trust the known terminals that
+    # enable it (Windows Terminal, ANSICON, and terminals that set TERM).
+
+    if sys.platform == "win32":
+        return ("WT_SESSION" in environ or "ANSICON" in environ
+                or "TERM" in environ)
+    return True
+
+# The status line of both Job and AsyncJob:
+
+_status_template = "pending: {}\t running: {}\t finished: {}\t failed: {}"
+
 # _hide_status() and _show_status() are the two functions that handle
 # writing and overwriting the status.
 
@@ -67,24 +130,22 @@ def _hide_status():
     """Remove previous status from screen.
     """
 
-    # Overwrite previous status with whitespaces, and return cursor to the
-    # beginning of the line.
+    # Return the cursor to the beginning of the line, and erase it.
     #
-    # Note that each character is replaced with a ' ', except '\t' that
-    # just moves the cursor.
+    # On terminals without ANSI support, we overwrite previous status with
+    # whitespaces instead. Note that each character is replaced with a ' ',
+    # except '\t' that just moves the cursor.
     #
     # Some special characters, like '\n', are mishandled; That's OK, we
     # don't expect them to appear in status.
 
     global _status
     if _status is not None:
-        space = ""
-        for c in _status:
-            if c == '\t':
-                space += "\t"
-            else:
-                space += " "
-        _print("\r" + space + "\r", end = "", flush = True)
+        if _ansi():
+            _print("\r\x1b[2K", end = "", flush = True)
+        else:
+            space = "".join("\t" if c == '\t' else " " for c in _status)
+            _print("\r" + space + "\r", end = "", flush = True)
     _status = None
 
 def _show_status(status):
@@ -106,11 +167,6 @@ def print(*args, **kw):
         if status is not None:
             _show_status(status)
 
-def _generate_tid():
-    """Generate a random thread ID.
-    """
-    return ''.join((choice("0123456789abcdef") for i in range(16)))
-
 class Job(object):
     def __init__(self, target, n_threads = 1, n_attempts = 1, factory = False):
         """Initialize a new Job object.
@@ -143,19 +199,34 @@ class Job(object):
         # Initialize Object's Fields
         # **************************
 
-        # The target function or target factory:
+        # The target function or target factory, and its version (which is
+        # incremented whenever the target is replaced):
 
         self._target = (target, factory)
+        self._target_version = 0
+
+        # The queues of inputs to be processed. Each worker thread owns one
+        # deque (by its slot index), and steals from the other deques when its
+        # own deque is empty. Producers distribute inputs in a round-robin
+        # fashion, using self._next_deque as the position.
+
+        self._deques = [deque() for i in range(max(n_threads, 1))]
+        self._next_deque = 0
 
-        # The queue of inputs to be processed:
+        # Failed inputs that should be attempted again are kept separately,
+        # so that workers and producers do not touch the same deques. Workers
+        # prefer these inputs over new ones.
 
-        self._queue = Queue()
+        self._retries = deque()
 
         # The set of all inputs ever added:
 
         self._inputs = set()
 
-        # The dictionaries that store the results and the excpetions:
+        # The dictionaries that store the results and the excpetions.
+        #
+        # No locks are needed: storing a single item, looking one up, and
+        # copying a dictionary are all atomic operations.
 
         self._results = {}
         self._exceptions = {}
@@ -165,93 +236,297 @@ class Job(object):
         self._n_attempts = n_attempts
         self._n_threads = n_threads
 
-        # Thread management:
+        # Thread management. self._threads[idx] is the thread that owns the
+        # deque of slot idx, or None if the slot is free; self._n_alive is the
+        # number of threads.
 
-        self._threads = {}
-        self._n_paused = 0
+        self._threads = [None] * len(self._deques)
+        self._n_alive = 0
+        self._paused = False
+
+        # Each thread appends an item to self._busy before it takes an input,
+        # and pops an item after it is done with it; hence the length of
+        # self._busy is the number of inputs being processed. (Both
+        # operations are atomic, so no lock is needed.)
+
+        self._busy = deque()
+
+        # Similarly, Job._push() appends an item to self._unfinished for each
+        # input it queues, and a thread pops an item after it has stored the
+        # input's result or exception (but not when the input is to be
+        # attempted again). Hence Job.wait() is done exactly when
+        # self._unfinished is empty; unlike the sum of the pending and
+        # running counters, this is a single read, so it cannot miss an input
+        # that moves between the deques and self._busy.
+
+        self._unfinished = deque()
 
         # Locks:
 
         self._ilock = Lock()    # input set lock
-        self._rlock = Lock()    # results lock
-        self._elock = Lock()    # exceptions lock
-        self._tlock = Lock()    # thread dict lock
-        self._block = Lock()    # pause lock
-        self._plock = Lock()    # paused threads counter lock
+        self._tlock = Lock()    # thread slots and counter lock
+
+        # Paused threads sleep on self._cv, until they are woken up by
+        # Job.resume() or Job.set_n_threads(). Idle threads sleep on it too,
+        # until they are woken up by new inputs (or for at most one second).
+        #
+        # self._epoch is incremented (while holding self._cv) whenever the job
+        # is paused, resumed or resized, or its target is replaced, so threads
+        # only need to compare it with the last epoch they have seen in order
+        # to know whether they should check their state.
+
+        self._cv = Condition()
+        self._epoch = 0
+
+        # The number of idle threads (modified while holding self._cv).
+
+        self._n_idle = 0
+
+        # Threads notify self._done_cv when they run out of inputs, and before
+        # they exit, to wake up Job.wait().
+
+        self._done_cv = Condition()
 
     def _start(self):
         """Spawn new threads as needed."""
 
         # We define `worker`, which will be the target of each thread.
 
-        def worker(tid):
-
-            # Initialize the thread's target_function, and memorize self._target.
+        def worker(idx):
 
-            target = self._target
-            if target[1]:
-                target_function = target[0]()
-            else:
-                target_function = target[0]
+            # A new thread has not seen any epoch or target version yet, so
+            # it checks its state, and initializes its target_function, on
+            # the first iteration.
 
-            while True:
-
-                # First, if the job is paused, we wait until it is resumed.
-                # (If the job is paused, self._block will be locked.)
+            epoch = None
+            version = None
 
-                with self._plock:
-                    self._n_paused += 1
-                with self._block:
-                    pass
-                with self._plock:
-                    self._n_paused -= 1
+            # The objects used on every iteration are never replaced (only
+            # mutated), so we bind them to local names, which saves attribute
+            # lookups in this loop.
 
-                # Then, we check whether there are too many threads, and if
-                # there are, we commit suicide.
+            busy = self._busy
+            unfinished = self._unfinished
+            pop = self._pop
+            results = self._results
 
-                with self._tlock:
-                    if len(self._threads) > self._n_threads:
-                        del self._threads[tid]
-                        return
+            while True:
 
-                # If target has changed - reinitialize the thread's 
+                # If the job has been paused, resumed, resized or given a new
+                # target since the last iteration, we check our state:
+                #
+                # First, we check whether there are too many threads, and if
+                # there are, we commit suicide. Otherwise, if the job is
+                # paused, we wait until it is resumed, and check again.
+                # (Both checks are done while holding self._cv, so we never
+                # record a new epoch without having seen that the job is not
+                # paused.)
+                #
+                # A paused thread that has no pending inputs to wait for
+                # exits after one second, like an idle thread (see
+                # Job._idle()), so that pausing a finished job does not keep
+                # the program alive.
+                #
+                # Then, if target has changed - we reinitialize the thread's
                 # target_function.
 
-                if self._target != target:
-                    target = self._target
-                    if target[1]:
-                        target_function = target[0]()
-                    else:
-                        target_function = target[0]
+                if self._epoch != epoch:
+                    with self._cv:
+                        et = time() + 1
+                        while True:
+                            with self._tlock:
+                                if self._n_alive > self._n_threads:
+                                    self._exit(idx)
+                                    return
+                            if not self._paused:
+                                break
+                            if self.get_n_pending() > 0:
+                                self._cv.wait()
+                                et = time() + 1
+                                continue
+                            t = et - time()
+                            if t <= 0:
+                                with self._tlock:
+                                    if self.get_n_pending() == 0:
+                                        self._exit(idx)
+                                        return
+                                continue
+                            self._cv.wait(t)
+                        epoch = self._epoch
+                        target = self._target
+                        target_version = self._target_version
+                    if target_version != version:
+                        version = target_version
+                        if target[1]:
+                            target_function = target[0]()
+                        else:
+                            target_function = target[0]
 
-                # Finally, we try to get an input of the queue, and process
-                # it.
+                # Finally, we try to get an input (from our own deque, or
+                # stolen from another thread's deque), and process it.
+                #
+                # If there are no inputs left, we wait for new inputs (see
+                # Job._idle()), and start over.
 
+                busy.append(None)
                 try:
-                    (arg, attempt) = self._queue.get(timeout = 1)
-                    result = target_function(arg)
-                    with self._rlock:
-                        self._results[arg] = result
-                except Empty:
-                    with self._tlock:
-                        del self._threads[tid]
-                    return
+                    (arg, attempt) = pop(idx)
+                except IndexError:
+                    busy.pop()
+                    if not self._idle(idx, epoch):
+                        return
+                    continue
+
+                try:
+                    results[arg] = target_function(arg)
+                    unfinished.pop()
                 except Exception as e:
                     if attempt < self._n_attempts:
-                        self._queue.put((arg, attempt + 1))
+                        self._retries.append((arg, attempt + 1))
                     else:
-                        with self._elock:
-                            self._exceptions[arg] = e
-
-        # We spawn the required number of threads.
+                        self._exceptions[arg] = e
+                        unfinished.pop()
+                busy.pop()
+
+        # We spawn the required number of threads: up to self._n_threads, but
+        # no more than the number of pending inputs that idle threads will
+        # not take.
+        #
+        # (Job.add() and Job.add_many() call us after Job._push() has put the
+        # new inputs in the deques, and woken up idle threads; an idle thread
+        # that exits instead leaves self._cv, and decrements self._n_idle,
+        # before we read it.)
 
         with self._tlock:
-            new_threads = self._n_threads - len(self._threads)
-            for j in range(new_threads):
-                tid = _generate_tid()
-                thread = Thread(target = worker, args = (tid,))
-                self._threads[tid] = thread
+            while len(self._deques) < self._n_threads:
+                self._deques.append(deque())
+                self._threads.append(None)
+            free = [idx for (idx, thread) in enumerate(self._threads)
+                    if thread is None]
+            new_threads = min(self._n_threads - self._n_alive,
+                              self.get_n_pending() - self._n_idle)
+            for idx in free[:max(0, new_threads)]:
+                thread = Thread(target = worker, args = (idx,))
+                self._threads[idx] = thread
+                self._n_alive += 1
                 thread.start()
+
+    def _idle(self, idx, epoch):
+        """Wait until there may be inputs to process, or until the job's
+        epoch is no longer the given epoch.
+
+        If neither happens within one second, the thread exits: its slot is
+        freed, and False is returned. Otherwise, True is returned.
+        """
+
+        # The queue has just become empty (as far as this thread knows), so
+        # Job.wait() may be done.
+
+        with self._done_cv:
+            self._done_cv.notify_all()
+
+        # Job._push() notifies self._cv after it adds inputs, so an input
+        # added after we check for pending inputs (while holding self._cv)
+        # always wakes us up.
+        #
+        # Before we exit, we check again while holding self._tlock: an input
+        # added after that check is followed by a _start() call that runs
+        # after we are gone, and spawns a new thread.
+        #
+        # If the job is paused, there is nothing for us to do until an input
+        # is added, so we keep waiting (and exit when the second is up) even
+        # if the epoch changes.
+
+        et = time() + 1
+        with self._cv:
+            self._n_idle += 1
+            try:
+                while ((self._epoch == epoch or self._paused)
+                       and self.get_n_pending() == 0):
+                    t = et - time()
+                    if t <= 0:
+                        with self._tlock:
+                            if self.get_n_pending() > 0:
+                                return True
+                            self._exit(idx)
+                            return False
+                    self._cv.wait(t)
+            finally:
+                self._n_idle -= 1
+        return True
+
+    def _exit(self, idx):
+        """Free the slot of an exiting thread, and wake up Job.wait().
+
+        Must be called while holding self._tlock.
+        """
+        self._threads[idx] = None
+        self._n_alive -= 1
+        with self._done_cv:
+            self._done_cv.notify_all()
+
+    def _pop(self, idx):
+        """Pop an input to be attempted again, if there is one. Otherwise, pop
+        an input from the deque of slot idx; if it is empty, steal an input
+        from the first non-empty deque, starting at a randomly chosen slot.
+
+        Raise IndexError if all the deques are empty.
+        """
+
+        # The owner pops from the right end, and thieves pop from the left
+        # end. Both deque.pop() and deque.popleft() are atomic, so no lock is
+        # needed.
+        #
+        # We check that a deque is non-empty before popping from it, since
+        # that is much cheaper than raising and catching IndexError. (Another
+        # thread may still empty it in between, hence the try blocks.)
+        #
+        # Stealing is common: a thread usually runs for a whole switch
+        # interval of the GIL, and a CPU-light target can empty the thread's
+        # own deque long before that. So we only pick a random starting slot,
+        # and scan the deques from there, instead of shuffling all the slots
+        # on every steal.
+
+        try:
+            if self._retries:
+                return self._retries.popleft()
+        except IndexError:
+            pass
+        try:
+            if self._deques[idx]:
+                return self._deques[idx].pop()
+        except IndexError:
+            pass
+        deques = self._deques
+        n = len(deques)
+        start = randrange(n)
+        for i in range(n):
+            victim = deques[(start + i) % n]
+            try:
+                if victim:
+                    return victim.popleft()
+            except IndexError:
+                pass
+        raise IndexError("no pending inputs")
+
+    def _push(self, args):
+        """Put new inputs in the deques, in a round-robin fashion, and wake up
+        idle threads to process them.
+
+        Must be called while holding self._ilock.
+        """
+
+        # Input number i goes to deque number (self._next_deque + i) % n, so
+        # each deque gets one slice of the inputs, in a single extendleft().
+
+        items = [(arg, 1) for arg in args]
+        self._unfinished.extend([None] * len(items))
+        n = max(1, min(self._n_threads, len(self._deques)))
+        for j in range(min(n, len(items))):
+            self._deques[(self._next_deque + j) % n].extendleft(items[j::n])
+        self._next_deque += len(items)
+        with self._cv:
+            self._cv.notify(len(items))
             
     def add(self, arg, force = False):
         """Add a new input to the queue to be processed.
@@ -260,10 +535,11 @@ class Job(object):
             arg - the input to be processed. Must be hashable.
         """
         with self._ilock:
-            if arg not in self._inputs or force:
-                self._inputs.add(arg)
-                self._queue.put((arg, 1))
-                self._start()
+            if arg in self._inputs and not force:
+                return
+            self._inputs.add(arg)
+            self._push([arg])
+        self._start()
 
     def add_many(self, args, force = False):
         """Add multiple new inputs to the queue to be processed.
@@ -272,47 +548,54 @@ class Job(object):
             args - an iterable that yields inputs. The inputs must be hashable.
         """
         with self._ilock:
-            for arg in args:
-                if arg not in self._inputs or force:
-                    self._inputs.add(arg)
-                    self._queue.put((arg, 1))
+
+            # We remove duplicates (keeping the original order), and then
+            # inputs that were already added, using bulk operations rather
+            # than checking the inputs one by one.
+
+            args = dict.fromkeys(args)
+            if not force:
+                for arg in self._inputs.intersection(args):
+                    del args[arg]
+            self._inputs.update(args)
+            self._push(args)
         self._start()
 
     def get_n_pending(self):
         """Get the number of pending inputs (not reliable!)
         """
-        return self._queue.qsize()
+        return len(self._retries) + sum(map(len, self._deques))
 
     def get_n_finished(self):
         """Get the number of inputs for which processing was finished 
         successfully.
         """
-        with self._rlock:
-            return len(self._results)
+        return len(self._results)
 
     def get_n_running(self):
         """Get the number of inputs being processed right now (not reliable!)
         """
-        with self._tlock:
-            return len(self._threads) - self._n_paused
+        return len(self._busy)
 
     def get_n_failed(self):
         """Get the number of inputs for which processing has raised an 
         exception.
         """
-        with self._elock:
-            return len(self._exceptions)
+        return len(self._exceptions)
 
     def _get_status_string(self):
         """Get the status string (to be printed by self.print_status() or 
         self.wait().
         """
-        stats = (self.get_n_pending(), 
-                 self.get_n_running(), 
-                 self.get_n_finished(), 
+
+        # All the counters are read without locks, so the status is not a
+        # consistent snapshot; that's OK, it is only a progress report.
+
+        stats = (self.get_n_pending(),
+                 self.get_n_running(),
+                 self.get_n_finished(),
                  self.get_n_failed())
-        template = "pending: {}\t running: {}\t finished: {}\t failed: {}"
-        return template.format(*stats)
+        return _status_template.format(*stats)
 
     def print_status(self):
         """Show the job's current status."""
@@ -337,22 +620,30 @@ class Job(object):
             if show_status:
                 with _plock:
                     _show_status(self._get_status_string())
-            while self.get_n_running() + self.get_n_pending() > 0:
-                with self._tlock:
-                    threads = list(self._threads.values())
-                for thread in threads:
-                    while thread.is_alive():
-                        if timeout is None:
-                            thread.join(timeout = 1)
-                        else:
-                            thread.join(timeout = min(1, et - time()))
-                        ct = time()
-                        if timeout is not None and ct >= et:
-                            raise KeyboardInterrupt()
-                        if ct >= pt + 1 and show_status:
-                            pt = ct
-                            with _plock:
-                                _show_status(self._get_status_string())
+
+            # We sleep on self._done_cv until a thread runs out of inputs,
+            # waking up at least once a second (so that the status can be
+            # refreshed, and so that KeyboardInterrupt is handled even where
+            # waiting for a lock without a timeout cannot be interrupted).
+            #
+            # We release self._done_cv before we print the status, so that
+            # threads never wait for a slow standard output.
+
+            while True:
+                with self._done_cv:
+                    if not self._unfinished:
+                        break
+                    if timeout is None:
+                        self._done_cv.wait(1)
+                    else:
+                        self._done_cv.wait(min(1, et - time()))
+                ct = time()
+                if timeout is not None and ct >= et:
+                    raise KeyboardInterrupt()
+                if ct >= pt + 1 and show_status:
+                    pt = ct
+                    with _plock:
+                        _show_status(self._get_status_string())
             if show_status:
                 with _plock:
                     _hide_status()
@@ -363,7 +654,10 @@ class Job(object):
 
     def set_n_threads(self, n):
         """See help(Job.__init__) for details."""
-        self._n_threads = n
+        with self._cv:
+            self._n_threads = n
+            self._epoch += 1
+            self._cv.notify_all()
         self._start()
 
     def set_target(self, target, factory = False):
@@ -377,7 +671,10 @@ class Job(object):
         See help(Job.__init__) for details about the requirements for a target
         function (or a target factory).
         """
-        self._target = (target, factory)
+        with self._cv:
+            self._target = (target, factory)
+            self._target_version += 1
+            self._epoch += 1
 
     def set_n_attempts(self, n):
         """See help(Job.__init__) for details."""
@@ -395,41 +692,43 @@ class Job(object):
 
         It can be later resumed by Job.resume().
         """
-        self._block.acquire(False)
+        with self._cv:
+            self._paused = True
+            self._epoch += 1
 
     def resume(self):
         """Resume a paused job.
 
         A job can be paused by Job.pause().
         """
-        self._block.release()
+        with self._cv:
+            self._paused = False
+            self._epoch += 1
+            self._cv.notify_all()
 
     def has_result(self, arg):
         """Check whether an input was processed successfully.
 
         If it has, the result can retrieved using Job.get_result().
         """
-        with self._rlock:
-            return arg in self._results
+        return arg in self._results
 
     def get_result(self, arg):
         """Get the result for a specific input.
 
         Raise an exception if the input was not processed successfully.
         """
-        with self._rlock:
-            return self._results[arg]
+        return self._results[arg]
 
     def get_results(self):
         """Return a dictionary of all the results for all 
         the successfully-processed inputs.
 
-        Note that if there are many results, costructing the dictionary may
-        take some time, and running threads may be blocked during this time.
+        Note that the dictionary is a snapshot: results of inputs that are
+        still being processed may be added to the job right after it is
+        constructed.
         """
-        with self._rlock:
-            results = self._results.copy()
-        return results
+        return self._results.copy()
 
     def has_exception(self, arg):
         """Check whether a specific input was processed but failed (the target
@@ -437,8 +736,7 @@ class Job(object):
 
         If it has, the exception can be retrieved using Job.get_exception().
         """
-        with self._elock:
-            return arg in self._exceptions
+        return arg in self._exceptions
 
     def get_exception(self, arg):
         """Get the exception raised by the target function for the given input.
@@ -446,28 +744,23 @@ class Job(object):
         Raise an exception if the input was not processed yet, or if it has 
         been processed successfully.
         """
-        with self._elock:
-            return self._exceptions[arg]
+        return self._exceptions[arg]
 
     def get_exceptions(self):
         """Return a dictionary of all the exceptions raised for all 
         the unsuccessfully-processed inputs.
 
-        Note that if there are many such exception, costructing the dictionary
-        may take some time, and running threads may be blocked during this 
-        time (if the target function raises an exception).
+        Note that the dictionary is a snapshot: exceptions of inputs that are
+        still being processed may be added to the job right after it is
+        constructed.
         """
-        with self._elock:
-            exceptions = self._exceptions.copy()
-        return exceptions
+        return self._exceptions.copy()
 
     def retry(self, arg):
         """Remove an input from the list of failed inputs, and put it back
         in the queue.
         """
-        with self._elock:
-            if arg in self._exceptions:
-                del self._exceptions[arg]
+        self._exceptions.pop(arg, None)
         self.add(arg, force = True)
 
     def retry_many(self, args):
@@ -481,11 +774,267 @@ class Job(object):
         """Remove all inputs from the list of failed inputs, and put them back
         in the queue.
         """
-        with self._elock:
-            args = []
-            for arg in list(self._exceptions):
-                del self._exceptions[arg]
-                args.append(arg)
-            self.add_many(args, force = True)
+        args = list(self._exceptions)
+        for arg in args:
+            self._exceptions.pop(arg, None)
+        self.add_many(args, force = True)
+
+class AsyncJob(object):
+    def __init__(self, target, n_tasks = 1, n_attempts = 1):
+        """Initialize a new AsyncJob object.
+
+        An AsyncJob is like a Job, except that the target is a coroutine
+        function, and the inputs are processed concurrently by asyncio tasks,
+        in a single thread, instead of by multiple threads. This is usually
+        better for I/O-bound targets that need many concurrent operations
+        (e.g. HTTP(S) queries using an asynchronous client).
+
+        The methods add, add_many, retry, retry_many and retry_all must be
+        called from within the running event loop (e.g. from a coroutine),
+        or else they raise RuntimeError; wait is a coroutine.
+
+        If the task of an input is cancelled before the input is processed
+        (e.g. because asyncio.run() returned while the input was pending or
+        running), the input is forgotten, as if it was never added: it can be
+        added again later, from the same event loop or from another one.
+
+        Args:
+            target - A coroutine function that gets one argument of hashable
+                     type.
+            n_tasks - An integer. The maximal number of inputs to be processed
+                      concurrently.
+            n_attempts - An integer. The number of attempts for each input
+                         before it is considered 'failed', and the exception
+                         is stored in the exceptions' dictionary.
+
+        Note:
+            The target and the number of attempts can be later changed by the
+            setter methods: AsyncJob.set_target and AsyncJob.set_n_attempts.
+        """
+        self._target = target
+        self._n_tasks = n_tasks
+        self._n_attempts = n_attempts
+
+        # Everything is accessed from the event loop's thread only, so no
+        # locks are needed.
+        #
+        # asyncio is imported by the methods that use it, rather than at the
+        # top of the module, so that importing meanwhile stays cheap for
+        # users of Job only.
+
+        self._inputs = set()
+        self._results = {}
+        self._exceptions = {}
+
+        # The tasks that were not done yet (each task removes itself when it
+        # is done), and the number of them that are processing an input right
+        # now (the others are waiting for the semaphore).
+        #
+        # A semaphore is bound to an event loop, so add() creates a new one
+        # whenever it is called from a different event loop than before (e.g.
+        # when the job is reused by another asyncio.run()); self._loop is the
+        # event loop of the current semaphore.
+
+        self._tasks = set()
+        self._n_running = 0
+        self._sem = None
+        self._loop = None
+
+    async def _run(self, arg, sem):
+        """Process one input (the body of the input's task).
+
+        If acquiring the semaphore fails, the exception is stored like an
+        exception raised by the target, so that the input is not lost.
+        """
+
+        # Before Python 3.8, asyncio.CancelledError is an Exception, so we
+        # re-raise it explicitly, rather than treating the cancellation of
+        # the task as a failed attempt. The input is removed from the set of
+        # inputs, so that a later add() does not ignore it.
+
+        import asyncio
+        try:
+            async with sem:
+                self._n_running += 1
+                try:
+                    attempt = 1
+                    while True:
+                        try:
+                            self._results[arg] = await self._target(arg)
+                            return
+                        except asyncio.CancelledError:
+                            raise
+                        except Exception as e:
+                            if attempt >= self._n_attempts:
+                                self._exceptions[arg] = e
+                                return
+                            attempt += 1
+                finally:
+                    self._n_running -= 1
+        except asyncio.CancelledError:
+            self._inputs.discard(arg)
+            raise
+        except Exception as e:
+            self._exceptions[arg] = e
+
+    def add(self, arg, force = False):
+        """Add a new input to be processed.
+
+        Args:
+            arg - the input to be processed. Must be hashable.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        if arg in self._inputs and not force:
+            return
+        self._inputs.add(arg)
+        if loop is not self._loop:
+            self._sem = asyncio.Semaphore(self._n_tasks)
+            self._loop = loop
+        task = asyncio.ensure_future(self._run(arg, self._sem))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def add_many(self, args, force = False):
+        """Add multiple new inputs to be processed.
+
+        Args:
+            args - an iterable that yields inputs. The inputs must be hashable.
+        """
+        for arg in dict.fromkeys(args):
+            self.add(arg, force)
+
+    def get_n_pending(self):
+        """Get the number of pending inputs."""
+        return len(self._tasks) - self._n_running
+
+    def get_n_finished(self):
+        """Get the number of inputs for which processing was finished 
+        successfully.
+        """
+        return len(self._results)
+
+    def get_n_running(self):
+        """Get the number of inputs being processed right now."""
+        return self._n_running
+
+    def get_n_failed(self):
+        """Get the number of inputs for which processing has raised an 
+        exception.
+        """
+        return len(self._exceptions)
+
+    def _get_status_string(self):
+        """Get the status string (to be printed by self.print_status() or 
+        self.wait().
+        """
+        stats = (self.get_n_pending(),
+                 self.get_n_running(),
+                 self.get_n_finished(),
+                 self.get_n_failed())
+        return _status_template.format(*stats)
+
+    def print_status(self):
+        """Show the job's current status."""
+        print(self._get_status_string())
+
+    async def wait(self, show_status = True, timeout = None):
+        """Wait until all inputs are processed.
+
+        Cancelling the coroutine stops it safely.
+
+        Args:
+            show_status - a boolean. Determines whether to continuously show
+                          the current running status.
+            timeout - a number. If timeout is a non-negative number, the method
+                      waits for at most this number of seconds, and then
+                      returns.
+        """
+        import asyncio
+        if timeout is not None:
+            et = time() + timeout
+        if show_status:
+            with _plock:
+                _show_status(self._get_status_string())
+        try:
+            while self._tasks:
+                t = None if timeout is None else et - time()
+                if show_status:
+                    t = 1 if t is None else min(1, t)
+                if t is not None and t <= 0:
+                    break
+                await asyncio.wait(list(self._tasks), timeout = t)
+                if show_status:
+                    with _plock:
+                        _show_status(self._get_status_string())
+        finally:
+            if show_status:
+                with _plock:
+                    _hide_status()
+
+    def set_target(self, target):
+        """Replace the coroutine function to be applied for each input.
+
+        See help(Job.set_target) for details.
+        """
+        self._target = target
+
+    def set_n_attempts(self, n):
+        """See help(AsyncJob.__init__) for details."""
+        self._n_attempts = n
+
+    def has_result(self, arg):
+        """Check whether an input was processed successfully."""
+        return arg in self._results
+
+    def get_result(self, arg):
+        """Get the result for a specific input.
+
+        Raise an exception if the input was not processed successfully.
+        """
+        return self._results[arg]
+
+    def get_results(self):
+        """Return a dictionary of all the results for all 
+        the successfully-processed inputs.
+        """
+        return self._results.copy()
+
+    def has_exception(self, arg):
+        """Check whether a specific input was processed but failed."""
+        return arg in self._exceptions
+
+    def get_exception(self, arg):
+        """Get the exception raised by the target for the given input.
+        
+        Raise an exception if the input was not processed yet, or if it has 
+        been processed successfully.
+        """
+        return self._exceptions[arg]
+
+    def get_exceptions(self):
+        """Return a dictionary of all the exceptions raised for all 
+        the unsuccessfully-processed inputs.
+        """
+        return self._exceptions.copy()
+
+    def retry(self, arg):
+        """Remove an input from the list of failed inputs, and add it again.
+        """
+        self._exceptions.pop(arg, None)
+        self.add(arg, force = True)
+
+    def retry_many(self, args):
+        """Remove multiple inputs from the list of failed inputs, and add them
+        again.
+        """
+        for arg in args:
+            self.retry(arg)
+
+    def retry_all(self):
+        """Remove all inputs from the list of failed inputs, and add them
+        again.
+        """
+        self.retry_many(list(self._exceptions))
 
-__all__ = ["Job", "print", "Lock"]
+__all__ = ["Job", "AsyncJob", "print", "Lock"]
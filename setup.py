@@ -13,7 +13,7 @@ setup(
     py_modules=['meanwhile'],
     license='MIT',
     install_requires=[],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     classifiers=[
         'Development Status :: 5 - Production/Stable',
         'License :: OSI Approved :: MIT License',